@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# Pre-commit hook that asks Claude to recommend a semantic version for the staged changes,
+# then updates the Version constant in internal/utils/version.go to match.
+# Requires the ANTHROPIC_API_KEY environment variable and the anthropic Python package.
+# If either is missing, the hook is a no-op so commits are never blocked.
+
+import os
+import re
+import subprocess
+import sys
+
+try:
+    import anthropic
+except ImportError:
+    anthropic = None
+
+VERSION_FILE = "internal/utils/version.go"
+MODEL = "claude-3-7-sonnet-latest"
+
+# Compile once at import; these run on every commit.
+_VERSION_RE = re.compile(r'const\s+Version\s*=\s*"([^"]+)"')
+_VERSION_SUB_RE = re.compile(r'(const\s+Version\s*=\s*)"[^"]+"')
+_SEMVER_RE = re.compile(r"\d+\.\d+\.\d+")
+
+# Static instructions for the model. Keep this block stable so prompt caching stays effective;
+# anything that varies per commit (current version, diff) goes in a separate content block.
+meta_prompt = """You are choosing the semantic version for the next release of the hldbx CLI.
+You will be given the current version and the staged git diff.
+Respond with only the new version number, in MAJOR.MINOR.PATCH form, and nothing else.
+Rules:
+- If the diff is empty or contains edits only to internal/utils/version.go, respond with the current version unchanged.
+- Bump MAJOR for breaking changes to the CLI or its configuration.
+- Bump MINOR for new backwards-compatible functionality.
+- Bump PATCH for bug fixes, docs, and internal changes."""
+
+# Good for performance to create the Anthropic client just once per process.
+# Each new client builds a fresh httpx connection pool and pays the TLS handshake again.
+_client_cache: dict[str, "anthropic.Anthropic"] = {}
+
+
+def get_client(api_key: str = None) -> "anthropic.Anthropic":
+    """Return a cached Anthropic client for the given API key. Create it if necessary."""
+    key = api_key or os.environ.get("ANTHROPIC_API_KEY", "")
+    client = _client_cache.get(key)
+    if client is None:
+        client = _client_cache.setdefault(key, anthropic.Anthropic(api_key=key))
+    return client
+
+
+def get_version_from_file(path: str = VERSION_FILE) -> tuple:
+    """Return (version, file content) parsed from the Go version file."""
+    with open(path) as f:
+        content = f.read()
+    match = _VERSION_RE.search(content)
+    if not match:
+        print(f"pre-commit: could not find Version in {path}", file=sys.stderr)
+        sys.exit(1)
+    return match.group(1), content
+
+
+def update_version_in_file(new_version: str, content: str, path: str = VERSION_FILE) -> None:
+    """Rewrite the Version constant in the Go version file and re-stage it."""
+    updated = _VERSION_SUB_RE.sub(rf'\1"{new_version}"', content)
+    with open(path, "w") as f:
+        f.write(updated)
+    subprocess.run(["git", "add", path], check=True)
+
+
+def main() -> int:
+    if anthropic is None or not os.environ.get("ANTHROPIC_API_KEY"):
+        # No SDK or no key: skip the version check rather than block the commit.
+        return 0
+
+    version, content = get_version_from_file()
+
+    # One git spawn covers both questions: "what changed?" and "did anything other than the
+    # version file change?". Excluding the version file from the patch means an empty result
+    # is exactly the version-only case, with no second subprocess needed.
+    diff = subprocess.run(["git", "diff", "--staged", "--", ".", f":(exclude){VERSION_FILE}"],
+                          capture_output=True, text=True, check=True)
+    diff_output = diff.stdout
+
+    if not diff_output.strip():
+        # Empty or version-only commit. The prompt tells Claude to answer with the current
+        # version in this case, so don't pay a network round-trip to be told "same version".
+        return 0
+
+    client = get_client()
+    # Two content blocks: the static instructions are marked cacheable so repeat commits in a
+    # session are billed as cached input tokens; only the per-commit block is fresh input.
+    # Stream the response with a small max_tokens: the reply is a short semver string, so
+    # capping the output bounds both the tail latency and the billed output tokens. Drain
+    # the stream fully before validating - breaking out on the first match would truncate
+    # "0.1.10" to "0.1.1" when a chunk boundary splits the digits. Version selection is
+    # deterministic, not creative, hence temperature 0.
+    buf = ""
+    with client.messages.stream(
+        model=MODEL,
+        max_tokens=16,
+        temperature=0,
+        messages=[{
+            "role": "user",
+            "content": [
+                {"type": "text",
+                 "text": meta_prompt,
+                 "cache_control": {"type": "ephemeral"}},
+                {"type": "text",
+                 "text": f"Current version: {version}\n\nStaged diff:\n{diff_output}"},
+            ],
+        }],
+    ) as stream:
+        for text in stream.text_stream:
+            buf += text
+    new_version = buf.strip()
+
+    if not _SEMVER_RE.fullmatch(new_version):
+        # Don't block the commit on an unexpected model response.
+        print(f"pre-commit: unexpected version suggestion '{new_version}', keeping {version}", file=sys.stderr)
+        return 0
+
+    if new_version != version:
+        update_version_in_file(new_version, content)
+        print(f"pre-commit: bumped version {version} -> {new_version}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
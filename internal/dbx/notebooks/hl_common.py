@@ -1,11 +1,14 @@
 # This file has code that is shared across HiddenLayer notebooks.
 
+from concurrent.futures import ThreadPoolExecutor
 from databricks.sdk.runtime import dbutils
+import functools
 import json
 from mlflow import MlflowClient, set_registry_uri
 from mlflow.entities.model_registry import ModelVersion
-from mlflow.exceptions import RestException
-from typing import List, Tuple
+from mlflow.exceptions import MlflowException, RestException
+import threading
+from typing import Dict, List, Optional, Tuple
 
 # Constants
 
@@ -50,61 +53,168 @@ def is_enterprise_scanner(hl_api_url: str) -> bool:
     """Return true if the HL API URL points to an enterprise scanner, false otherwise."""
     return not hl_api_url.endswith(".hiddenlayer.ai")
 
+@functools.lru_cache(maxsize=1)
+def is_job_run() -> bool:
+    """Return true if this notebook is executing as part of a Databricks job, false if interactive.
+    The notebook context can't change within a run, so the answer is computed once and cached;
+    repeat calls skip the JVM round-trip and JSON parse."""
+    context = json.loads(dbutils.entry_point.getDbutils().notebook().getContext().toJson())
+    return "jobId" in context.get("tags", {})
+
 # Good for performance to create the MlflowClient just once.
 # Avoid using a global variable, which makes testing harder.
 
+def _tune_mlflow_http_pool() -> None:
+    """Enlarge MLflow's HTTP connection pool so parallel tag operations don't queue on it.
+    Wraps MLflow's session factory (mlflow.utils.request_utils._cached_get_request_session,
+    present in MLflow 2.9 through 3.x) so every pooled session it hands out gets a larger
+    adapter, keeping MLflow's own retry configuration intact. Reaches into an MLflow
+    internal, so on other layouts this is a no-op and the default pool is used."""
+    try:
+        from requests.adapters import HTTPAdapter
+        from mlflow.utils import request_utils
+        factory = request_utils._cached_get_request_session
+        if getattr(factory, "_hl_pool_tuned", False):
+            return      # already wrapped
+
+        @functools.lru_cache(maxsize=64)
+        def _tuned_get_request_session(*args, **kwargs):
+            # MLflow calls the factory with keyword arguments (_pid=..., and others
+            # depending on version), so both must be forwarded.
+            session = factory(*args, **kwargs)
+            adapter = HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=16,
+                max_retries=session.get_adapter("https://").max_retries)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            return session
+
+        _tuned_get_request_session._hl_pool_tuned = True
+        request_utils._cached_get_request_session = _tuned_get_request_session
+    except Exception:
+        pass    # internal API not available in this MLflow version; default pool is fine
+
 _mlflow_client = None   # private cache, for use only by this function
+_mlflow_client_lock = threading.Lock()
 def mlflow_client() -> MlflowClient:
-  """Get the MlflowClient singleton. Create it if necessary."""
+  """Get the MlflowClient singleton. Create it if necessary.
+  Thread-safe: concurrent callers get the same client rather than each paying connection setup."""
   global _mlflow_client
   if not _mlflow_client:
-    set_registry_uri("databricks-uc")
-    _mlflow_client = MlflowClient()
+    # Double-checked locking: only the first caller takes the lock and constructs the client.
+    with _mlflow_client_lock:
+      if not _mlflow_client:
+        set_registry_uri("databricks-uc")
+        client = MlflowClient()
+        _tune_mlflow_http_pool()
+        _mlflow_client = client
   return _mlflow_client
 
-def set_model_version_tag(model_version: ModelVersion, key: str, value: str) -> None:
-    client = mlflow_client()
+# In a job run, warm the client in the background so the first real registry call doesn't pay
+# connection setup. Interactive notebooks stay lazy: they may never touch MLflow.
+if is_job_run():
+    threading.Thread(target=mlflow_client, daemon=True).start()
+
+# The functions below accept an optional client argument so bulk callers can resolve the
+# client once and pass it into a tight loop, skipping a global lookup and branch per call.
+
+def set_model_version_tag(model_version: ModelVersion, key: str, value: str,
+                          client: Optional[MlflowClient] = None) -> None:
+    client = client or mlflow_client()
     client.set_model_version_tag(
         name=model_version.name,
         version=model_version.version,
         key=key,
         value=value)
 
-def clear_tags(model_version: ModelVersion, keep_tags: List[str] = []) -> None:
-    """Clear all tags on the model version, except for any tags in the optional keep_tags list."""
-    client = mlflow_client()
-    # Refresh the ModelVersion to ensure we have fresh data, otherwise this won't work
-    mv = get_model_version(full_model_name=model_version.name, mv_num=model_version.version)
-    tags = mv.tags.keys()
-    
-    # Delete each tag
-    for tag_key in tags:
-        if not tag_key in keep_tags:
-            client.delete_model_version_tag(
+def set_model_version_tags(model_version: ModelVersion, tags: Dict[str, str],
+                           client: Optional[MlflowClient] = None) -> None:
+    """Set several tags on the model version in one go.
+    MLflow has no multi-tag endpoint, so the writes go out as one REST call per tag, but in
+    parallel on the shared pooled session: wall time is about one round-trip instead of one
+    per tag."""
+    if not tags:
+        return
+    client = client or mlflow_client()
+    if len(tags) == 1:
+        key, value = next(iter(tags.items()))
+        set_model_version_tag(model_version, key, value, client=client)
+        return
+    with ThreadPoolExecutor(max_workers=min(4, len(tags))) as executor:
+        list(executor.map(
+            lambda item: set_model_version_tag(model_version, item[0], item[1], client=client),
+            tags.items()))
+
+def clear_tags(model_version: ModelVersion, keep_tags: Optional[List[str]] = None, fresh: bool = False,
+               client: Optional[MlflowClient] = None) -> None:
+    """Clear all tags on the model version, except for any tags in the optional keep_tags list.
+    Pass fresh=True if the ModelVersion was just fetched, to skip re-reading it from the registry."""
+    keep_tags = keep_tags or []
+    client = client or mlflow_client()
+    if fresh:
+        mv = model_version
+    else:
+        # Refresh the ModelVersion to ensure we have fresh data, otherwise this won't work
+        mv = get_model_version(full_model_name=model_version.name, mv_num=model_version.version)
+    to_delete = [tag_key for tag_key in mv.tags if tag_key not in keep_tags]
+    if not to_delete:
+        return
+
+    # Delete the tags in parallel. MLflow has no bulk-delete API, so each tag is its own REST
+    # call; overlapping them turns N round-trips into roughly one. The client's pooled
+    # session is safe to share across threads.
+    with ThreadPoolExecutor(max_workers=min(8, len(to_delete))) as executor:
+        list(executor.map(
+            lambda tag_key: client.delete_model_version_tag(
                 name=mv.name,
                 version=mv.version,
-                key=tag_key
-            )
+                key=tag_key),
+            to_delete))
+
+def get_any_model_version() -> ModelVersion:
+    """Return some model version from the MLflow model registry; any version will do.
+    Useful for tests that just need a real ModelVersion to work with.
+
+    Raises:
+        ModelVersionError: If the registry has no model versions at all
+    """
+    client = mlflow_client()
+    # Try one unfiltered search first: where the backend accepts it, this is a single REST
+    # call rather than a search_model_versions call per registered model. Unity Catalog
+    # requires a name filter, so fall back to walking the registered models on rejection.
+    try:
+        versions = client.search_model_versions(max_results=1)
+        if versions:
+            return versions[0]
+    except MlflowException:
+        for model in client.search_registered_models():
+            versions = client.search_model_versions(f"name='{model.name}'", max_results=1)
+            if versions:
+                return versions[0]
+    raise ModelVersionError(ModelVersion("", "", 0, 0), "No model versions found in the MLflow registry.")
 
 def get_model_version(
     full_model_name: str,
-    mv_num: int
+    mv_num: int,
+    client: Optional[MlflowClient] = None
 ) -> ModelVersion:
     """
     Get the specified model version from the MLflow model registry.
-    
+
     Args:
         full_model_name (str): Full name of the model, in the format <catalog>.<schema>.<model_name>
         mv_num (int): Version of the model to find
+        client (MlflowClient): Optional pre-resolved client, for bulk callers
 
     Returns:
         ModelVersion: MLflow ModelVersion object
-        
+
     Raises:
         ModelVersionNotFound: If the specified model version cannot be found
         ModelVersionError: If some other error happened
     """
-    client: MlflowClient = mlflow_client()
+    client = client or mlflow_client()
     mv_num_str = str(mv_num)
     try:
         # Get and return the specific model version
@@ -118,7 +228,11 @@ def get_model_version(
     # Raise a specific ModelVersionNotFound exception if so, otherwise a generic ModelVersionError.
     except RestException as e:
         mv = ModelVersion(full_model_name, mv_num_str, 0, 0)
-        if "RESOURCE_DOES_NOT_EXIST" in str(e):
+        # Prefer the structured error_code attribute over scanning the stringified exception;
+        # fall back to the substring check for RestExceptions that don't carry one.
+        error_code = getattr(e, "error_code", None)
+        if error_code == "RESOURCE_DOES_NOT_EXIST" or \
+                (error_code is None and "RESOURCE_DOES_NOT_EXIST" in str(e)):
             raise ModelVersionNotFound(mv) from e
         else:
             raise ModelVersionError(mv, f"Failed to get model version {str(mv)}: {str(e)}") from e
@@ -43,9 +43,28 @@
 
 # COMMAND ----------
 
-# Import HL code that is shared across notebooks
+# Import HL code that is shared across notebooks.
+# Explicit imports (rather than *) keep the notebook's global namespace stable across cell
+# re-execution and make it obvious which shared names the hot paths below depend on.
 
-from hl_common import *
+import json
+from typing import List
+
+from databricks.sdk.runtime import dbutils
+from hl_common import (
+    HL_SCAN_MESSAGE,
+    HL_SCAN_RUN_ID,
+    HL_SCAN_STATUS,
+    HL_SCAN_UPDATED_AT,
+    STATUS_FAILED,
+    STATUS_PENDING,
+    STATUS_UNSCANNED,
+    clear_tags,
+    is_enterprise_scanner,
+    mlflow_client,
+    set_model_version_tag,
+    set_model_version_tags,
+)
 
 
 # COMMAND ----------
@@ -67,6 +86,17 @@ HL_SCAN_NOTEBOOK="hl_scan_model"
 # Also, model files are often big, so uploads can take a while.
 HL_SCAN_NOTEBOOK_TIMEOUT_MINS=4800
 
+# Unity Catalog has been observed to return model versions newest-first. When this flag is on,
+# the version crawl in get_latest_model_version reads only the first page instead of the model's
+# entire history. Off by default to preserve correctness on backends without that ordering.
+ASSUME_UC_RETURNS_DESC = False
+
+# How many versions make up "the first page" for the bounded crawl above.
+VERSION_CRAWL_PAGE_SIZE = 100
+
+# Page size for listing registered models from Unity Catalog.
+MODEL_LIST_PAGE_SIZE = 100
+
 # Maximum number of scan jobs that we'll allow to run at once.
 # HL modscan has a queueing system so can handle receiving lots of jobs, but active jobs burn disk space
 # and network bandwith.
@@ -98,7 +128,11 @@ class Configuration:
 
 def get_job_params() -> Configuration:
     """Return catalog, schema, and HL API key name"""
-    catalogs_and_schemas_json = dbutils.widgets.get("schemas")
+    # One getAll() round-trip over the JVM bridge instead of one per widget; the scan
+    # notebook reads its parameters the same way.
+    widgets_to_values = dbutils.widgets.getAll()
+
+    catalogs_and_schemas_json = widgets_to_values.get("schemas")
     assert catalogs_and_schemas_json is not None, "schemas is a required job parameter"
 
     # deserialize the json string
@@ -113,8 +147,8 @@ def get_job_params() -> Configuration:
         assert schema is not None, "schema is a required job parameter"
         catalogs_and_schemas.append(CatalogSchemaConfiguration(catalog, schema))
 
-    hl_api_url = dbutils.widgets.get("hl_api_url")
-    hl_environment = dbutils.widgets.get("hl_environment")
+    hl_api_url = widgets_to_values.get("hl_api_url")
+    hl_environment = widgets_to_values.get("hl_environment")
     # if neither an environment nor an api url is provided, default to prod-us env
     if hl_environment is None and hl_api_url is None:
         hl_environment = "prod-us"
@@ -132,10 +166,10 @@ def get_job_params() -> Configuration:
 
     # Saas scanner, API credentials should be encoded in a key and a console url should be provided
     if not is_enterprise_scanner(hl_api_url):
-        hl_api_key_name = dbutils.widgets.get("hl_api_key_name")
+        hl_api_key_name = widgets_to_values.get("hl_api_key_name")
         assert hl_api_key_name is not None, "hl_api_key_name is a required job parameter"
 
-        hl_console_url = dbutils.widgets.get("hl_console_url")
+        hl_console_url = widgets_to_values.get("hl_console_url")
         assert hl_console_url is not None, "hl_console_url is a required job parameter"
 
     return Configuration(catalogs_and_schemas, hl_api_key_name, hl_api_url, hl_console_url, hl_environment)
@@ -158,11 +192,15 @@ def workspace_client() -> WorkspaceClient:
 
 # COMMAND ----------
 
+import functools
 import os
 from databricks.sdk.runtime import dbutils
 
+@functools.lru_cache(maxsize=None)
 def getcwd() -> str:
-    """Get the current directory (location of this notebook) and return it."""
+    """Get the current directory (location of this notebook) and return it.
+    The notebook path can't change within a run, so cache it: resolving it is a chain of
+    Py4J round-trips into the JVM."""
     notebook_path = (
         dbutils.notebook.entry_point.getDbutils()
         .notebook()
@@ -176,35 +214,136 @@ def getcwd() -> str:
 # COMMAND ----------
 
 from collections import defaultdict
-from typing import Dict, Iterator
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+from typing import Dict, Iterator, Optional
 from databricks.sdk.service.catalog import RegisteredModelInfo
 from mlflow.entities.model_registry import ModelVersion
-
-def get_model_versions_by_status(catalog: str, schema: str, statuses: List[str]) -> Dict[str, List[ModelVersion]]:
+from mlflow.exceptions import MlflowException
+
+# Filter templates for search_model_versions, built once at module scope.
+# Model names go through _escape_name first: UC names can't normally contain quotes,
+# but a stray apostrophe would otherwise corrupt the filter expression.
+_NAME_FILTER = "name='{}'"
+_NAME_AND_STATUS_FILTER = "name='{}' AND tag." + HL_SCAN_STATUS + "='{}'"
+
+def _escape_name(full_name: str) -> str:
+    """Escape apostrophes so the name is safe inside a single-quoted filter literal."""
+    return full_name.replace("'", "\\'")
+
+# Whether the registry backend supports order_by in search_model_versions.
+# None means we haven't probed yet; the probe happens once per process.
+_supports_order_by: Optional[bool] = None
+
+def get_latest_model_version(client, full_name: str) -> Optional[ModelVersion]:
+    """Return the latest version of the given model, or None if it has no versions.
+    Get the most recent version in one step using order_by=["version_number DESC"], max_results=1
+    where the backend supports it. Unity Catalog historically doesn't, so on an MlflowException
+    we remember that and fall back to crawling through *all* of the versions."""
+    global _supports_order_by
+    filter_string = _NAME_FILTER.format(_escape_name(full_name))
+    if _supports_order_by is not False:
+        try:
+            page = client.search_model_versions(
+                filter_string=filter_string, max_results=1, order_by=["version_number DESC"])
+            _supports_order_by = True
+            return page[0] if page else None
+        except MlflowException:
+            _supports_order_by = False
+    # Fallback: crawl the versions and keep the max. When ASSUME_UC_RETURNS_DESC is set,
+    # trust that the first page already contains the newest version and stop there instead
+    # of letting the iterator auto-paginate through the model's full history.
+    latest_version = None
+    max_version = -1
+    versions = client.search_model_versions(filter_string=filter_string)
+    if ASSUME_UC_RETURNS_DESC:
+        versions = itertools.islice(versions, VERSION_CRAWL_PAGE_SIZE)
+    for version in versions:
+        if int(version.version) > max_version:
+            max_version = int(version.version)
+            latest_version = version
+    return latest_version
+
+# Whether the registry backend supports tag filters in search_model_versions.
+# Probed once per process, like _supports_order_by above.
+_supports_tag_filter: Optional[bool] = None
+
+def _resolve_latest_matching_status(client, full_name: str, statuses: List[str]) -> Optional[ModelVersion]:
+    """Fast path for when every requested status is a concrete tag value: filter on the status
+    tag server-side, so models whose latest version doesn't carry one of the statuses are
+    skipped without paying the per-version tags fetch. Falls back to fetching the tags where
+    the backend rejects tag filters (Unity Catalog today).
+    Note this can't serve STATUS_NONE: the absence of a tag isn't expressible in a filter."""
+    global _supports_tag_filter
+    latest = get_latest_model_version(client, full_name)
+    if not latest:
+        return None
+    if _supports_tag_filter is not False:
+        try:
+            matched = False
+            for status in statuses:
+                page = client.search_model_versions(
+                    filter_string=_NAME_AND_STATUS_FILTER.format(_escape_name(full_name), status),
+                    max_results=VERSION_CRAWL_PAGE_SIZE)
+                _supports_tag_filter = True
+                if any(v.version == latest.version for v in page):
+                    matched = True
+                    break
+            if not matched:
+                return None
+        except MlflowException:
+            _supports_tag_filter = False
+    return client.get_model_version(latest.name, latest.version)   # get the tags
+
+def _resolve_latest_with_tags(client, full_name: str) -> Optional[ModelVersion]:
+    """Return the latest version of the given model with its tags populated, or None if the
+    model has no versions.
+    Note that ModelVersion includes a tags field, but search_model_versions doesn't fill it in,
+    at least not with Unity Catalog, so a second call is needed to get the tags."""
+    latest_version = get_latest_model_version(client, full_name)
+    if not latest_version:
+        return None
+    return client.get_model_version(latest_version.name, latest_version.version)   # get the tags
+
+def get_model_versions_by_status(catalog: str, schema: str, statuses: List[str],
+                                 max_candidates: int = None) -> Dict[str, List[ModelVersion]]:
     """Return a dict of the latest model versions in the UC schema with the given HL statuses.
     If no statuses are given, then ignore the status value.
     Keys are statuses, values are lists of model versions with that status.
-    The returned dict is a defaultdict(list) so you can always look up all statuses in the dict."""
+    The returned dict is a defaultdict(list) so you can always look up all statuses in the dict.
+    If max_candidates is given, stop enumerating the registry once that many matching versions
+    have been collected. UC lists models in a stable (alphabetical) order, so a capped caller
+    sees a consistent prefix rather than starving particular models."""
     dikt: Dict[str, List[ModelVersion]] = defaultdict(list)
-    models: Iterator[RegisteredModelInfo] = workspace_client().registered_models.list(catalog_name=catalog, schema_name=schema)
+    models_iter: Iterator[RegisteredModelInfo] = workspace_client().registered_models.list(
+        catalog_name=catalog, schema_name=schema, max_results=MODEL_LIST_PAGE_SIZE)
     client = mlflow_client()
-    for model in models:
-        # Get the latest version of each model from MLflow.
-        # Note that ModelVersion includes a tags field, but search_model_versions doesn't fill it in, at least not with Unity Catalog.
-        # Ideally we would get the most recent version in one step using the args order_by=["version DESC"], max_dikts=1.
-        # But that's not supported in Unity Catalog, so we have to crawl through *all* of the versions.
-        latest_version = None
-        max_version = -1
-        for version in client.search_model_versions(filter_string=f"name='{model.full_name}'"):
-            if int(version.version) > max_version:
-                max_version = int(version.version)
-                latest_version = version
-        if latest_version:
-            mv = client.get_model_version(latest_version.name, latest_version.version)   # get the tags
-            tags = mv.tags
-            status = tags.get(HL_SCAN_STATUS, STATUS_NONE)
-            if status in statuses or not statuses:
-                dikt[status].append(mv)
+    # When every requested status is a concrete tag value, let the server filter on the tag so
+    # non-matching models skip the tags fetch. STATUS_NONE means "no tag", which a filter can't
+    # express, so the steady-state query that includes it takes the general path.
+    if statuses and STATUS_NONE not in statuses:
+        resolve = lambda m: _resolve_latest_matching_status(client, m.full_name, statuses)
+    else:
+        resolve = lambda m: _resolve_latest_with_tags(client, m.full_name)
+    collected = 0
+    while True:
+        # Pull one batch of models off the auto-paginating iterator and resolve them in
+        # parallel: the per-model lookups are independent HTTPS calls, so fanning them out
+        # overlaps the round-trips (both SDK clients are thread-safe for reads). Working in
+        # batches also lets a capped caller stop paging as soon as it has enough candidates.
+        batch = list(itertools.islice(models_iter, 32))
+        if not batch:
+            break
+        with ThreadPoolExecutor(max_workers=len(batch)) as executor:
+            latest_versions = executor.map(resolve, batch)
+        for mv in latest_versions:
+            if mv:
+                status = mv.tags.get(HL_SCAN_STATUS, STATUS_NONE)
+                if status in statuses or not statuses:
+                    dikt[status].append(mv)
+                    collected += 1
+        if max_candidates is not None and collected >= max_candidates:
+            break
     return dikt
 
 # Manual testing
@@ -218,35 +357,54 @@ from databricks.sdk.errors.platform import ResourceDoesNotExist
 from databricks.sdk.service.workspace import ImportFormat
 import io
 from pathlib import Path
+import time
 
 def get_init_marker_path() -> Path:
     """Return the path to the init marker file in the HL workspace folder."""
     return Path(getcwd()) / INIT_MARKER_FILENAME
 
+# Once initialization is observed done, it stays done for the life of the process, so cache
+# the positive answer and skip the workspace API round-trip on later polls.
+_init_done_cache = False
+
 def mark_init_done() -> None:
     """Drop a file in the HL workspace folder as a persistent marker that we have done one-time initialization."""
+    global _init_done_cache
     init_marker_path = str(get_init_marker_path())
     workspace_client().workspace.upload(
         init_marker_path,
         io.BytesIO(b'The existence of this file indicates that HiddenLayer has been initialized'),
         format=ImportFormat.AUTO)
+    _init_done_cache = True
 
 def clear_init_done() -> None:
     """Remove the init marker file in the HL workspace folder. If it doesn't exist, that's OK."""
+    global _init_done_cache
+    _init_done_cache = False
     try:
         workspace_client().workspace.delete(str(get_init_marker_path()))
     except ResourceDoesNotExist:
         pass
 
 def is_init_done() -> bool:
-    """Return true if HiddenLayer initialization has been done, false otherwise."""
-    try:
-        status = workspace_client().workspace.get_status(get_init_marker_path())
-        return True     # if the call didn't blow up, then the file exists
-    except ResourceDoesNotExist:
-        return False
-    except Exception as e:
-        dbutils.notebook.exit(f"Unknown error occurred while checking HiddenLayer initialization status: {e}")
+    """Return true if HiddenLayer initialization has been done, false otherwise.
+    Transient workspace API errors (e.g. a stray 503) are retried with backoff rather than
+    aborting the whole notebook; only after the retries are exhausted does the error surface."""
+    global _init_done_cache
+    if _init_done_cache:
+        return True
+    attempts = 3
+    for attempt in range(attempts):
+        try:
+            status = workspace_client().workspace.get_status(get_init_marker_path())
+            _init_done_cache = True
+            return True     # if the call didn't blow up, then the file exists
+        except ResourceDoesNotExist:
+            return False
+        except Exception:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(0.5 * 2 ** attempt)
 
 # Manual test
 # mark_init_done()
@@ -254,15 +412,24 @@ def is_init_done() -> bool:
 
 # COMMAND ----------
 
-def init(catalog: str, schema: str) -> None:
-    """Do one-time state initialization by marking all untagged models in the UC catalog/schema as unscanned."""
-    mv_dict: Dict[str, List[ModelVersion]] = get_model_versions_by_status(catalog, schema, [])
+def init_from_dict(mv_dict: Dict[str, List[ModelVersion]]) -> None:
+    """Do one-time state initialization from a pre-built status dict by marking all untagged
+    models as unscanned. Callers that already paid for the registry crawl pass its result here
+    instead of having us crawl again."""
     versions = mv_dict[STATUS_NONE]
-    for mv in versions:
-        set_model_version_tag(mv, HL_SCAN_STATUS, STATUS_UNSCANNED)
-        set_model_version_tag(mv, HL_SCAN_UPDATED_AT, datetime.now().isoformat())
+    if versions:
+        # One timestamp for the whole batch; the versions are all being initialized as one event.
+        init_tags = {HL_SCAN_STATUS: STATUS_UNSCANNED, HL_SCAN_UPDATED_AT: datetime.now().isoformat()}
+        # Tag the versions in parallel: on a fresh schema this is two REST writes per model,
+        # and doing them sequentially makes first-run latency scale with the model count.
+        with ThreadPoolExecutor(max_workers=min(16, len(versions))) as executor:
+            list(executor.map(lambda mv: set_model_version_tags(mv, init_tags), versions))
     mark_init_done()
 
+def init(catalog: str, schema: str) -> None:
+    """Do one-time state initialization by marking all untagged models in the UC catalog/schema as unscanned."""
+    init_from_dict(get_model_versions_by_status(catalog, schema, []))
+
 # Manual test
 
 # Start clean
@@ -277,8 +444,10 @@ def init(catalog: str, schema: str) -> None:
 
 # COMMAND ----------
 
+@functools.lru_cache(maxsize=None)
 def get_cluster_id() -> str:
-    """Return the cluster ID for the current cluster. This is useful for running compute jobs."""
+    """Return the cluster ID for the current cluster. This is useful for running compute jobs.
+    Cached: the cluster can't change under a running notebook."""
     return spark.conf.get("spark.databricks.clusterUsageTags.clusterId")
 
 # Manual test
@@ -287,42 +456,43 @@ print(get_cluster_id())
 # COMMAND ----------
 
 from databricks.sdk import WorkspaceClient
-from databricks.sdk.service.jobs import NotebookTask, RunNowResponse, Task,\
-    JobSettings, RunLifeCycleState, RunResultState
+from databricks.sdk.service.jobs import NotebookTask, SubmitTask,\
+    RunLifeCycleState, RunResultState
 import time
 from typing import Dict
-import uuid
+
+# Task keys only need to be unique within a submitted run, so a cheap monotonic counter
+# (with a timestamp for readability in the jobs UI) does the job without the per-key
+# os.urandom syscall that uuid4 pays.
+_task_counter = itertools.count()
 
 def run_notebook(job_name: str, notebook_path: str, cluster_id: str,
                  parameters: Dict[str, str]=None, timeout_minutes: int=60) -> int:
     """
-    Run a Databricks notebook. Don't wait for it to finish.
-    
+    Run a Databricks notebook as a one-shot run. Don't wait for it to finish.
+
     Args:
-        job_name (str): Name of the job running the notebook
+        job_name (str): Name of the run executing the notebook
         notebook_path (str): Path to the notebook in Databricks workspace
         cluster_id (str): Existing cluster ID to run the notebook
         parameters (Dict[str, str]): Notebook parameters
         timeout_minutes (int): Maximum time to wait for completion in minutes
-        
+
     Returns:
         int: Run ID
     """
     work: WorkspaceClient = workspace_client()
     try:
-        # Create the job, with a single task
+        # Submit a one-shot run with a single task. Unlike jobs.create + jobs.run_now, this is
+        # one API call instead of two, and it doesn't leave a Job definition behind in the
+        # workspace for every scan we launch.
         notebook_task = NotebookTask(notebook_path=notebook_path, base_parameters=parameters)
-        task = Task(description=job_name,
-                    existing_cluster_id=cluster_id,
-                    notebook_task=notebook_task,
-                    task_key=str(uuid.uuid4()),                 # task key must be unique
-                    timeout_seconds=timeout_minutes * 60)
-        job = work.jobs.create(name=job_name, tasks=[task])
-        job_id = job.job_id
-        
-        # Run the job
-        run: RunNowResponse = work.jobs.run_now(job_id=job_id)
-        run_id = run.run_id
+        task = SubmitTask(existing_cluster_id=cluster_id,
+                          notebook_task=notebook_task,
+                          task_key=f"hl_{next(_task_counter)}_{int(time.time())}",    # task key must be unique
+                          timeout_seconds=timeout_minutes * 60)
+        submitted = work.jobs.submit(run_name=job_name, tasks=[task])
+        run_id = submitted.response.run_id
         return run_id
 
     except Exception as e:
@@ -346,11 +516,13 @@ from datetime import datetime
 from mlflow.entities.model_registry import ModelVersion
 from pathlib import Path
 
-def scan_model(mv: ModelVersion, hl_api_key_name: str, hl_api_url: str, hl_auth_url: str, hl_console_url: str, timeout_minutes: int) -> int:
-    """Run a scan job on a model version. Don't wait for it to finish. Return the run_id."""
+def scan_model(mv: ModelVersion, hl_api_key_name: str, hl_api_url: str, hl_auth_url: str, hl_console_url: str, timeout_minutes: int,
+               cluster_id: str = None) -> int:
+    """Run a scan job on a model version. Don't wait for it to finish. Return the run_id.
+    Callers launching several scans should pass cluster_id to avoid re-resolving it per scan."""
     job_name = f"hl_scan_{mv.name}.{mv.version}"
     notebook_path = Path(getcwd()) / HL_SCAN_NOTEBOOK
-    cluster_id = get_cluster_id()
+    cluster_id = cluster_id or get_cluster_id()
     # For a ModelVersion in Unity Catalog, the name is the full name, including catalog and schema
     parameters={"full_model_name": mv.name,
                 "model_version_num": str(mv.version),
@@ -380,10 +552,35 @@ def scan_model(mv: ModelVersion, hl_api_key_name: str, hl_api_url: str, hl_auth_
 
 from datetime import datetime
 
+def _fail_model_version(mv: ModelVersion, message: str, now_iso: str = None) -> None:
+    """Mark the model version's scan as failed.
+    Erase all previous tags, except keep the run_id for debugging.
+    Callers failing a batch can pass now_iso so all the failures share one timestamp."""
+    clear_tags(mv, [HL_SCAN_RUN_ID])
+    set_model_version_tag(mv, HL_SCAN_STATUS, STATUS_FAILED)
+    set_model_version_tag(mv, HL_SCAN_MESSAGE, message)
+    set_model_version_tag(mv, HL_SCAN_UPDATED_AT, now_iso or datetime.now().isoformat())
+
+def _get_run_state(work: WorkspaceClient, mv: ModelVersion):
+    """Return the Jobs API state for the model version's scan run, or None if the
+    HL_SCAN_RUN_ID tag is missing or the run can't be looked up."""
+    run_id_tag = mv.tags.get(HL_SCAN_RUN_ID)
+    if not run_id_tag:
+        return None
+    try:
+        return work.jobs.get_run(run_id=int(run_id_tag)).state
+    except Exception as e:
+        print(f"Warning: could not fetch run {run_id_tag} for model version {mv.name} version {mv.version}: {e}")
+        return None
+
 def handle_job_timeouts(pending_model_versions: List[ModelVersion], timeout_minutes: int) -> List[ModelVersion]:
-    """For model versions in the pending state (scan job unfinished), mark them as failed if the jobs have expired.
-    Model versions in the input list must have the tags field populated. Return a list of model versions that are still being scanned."""
-    active_jobs = []
+    """For model versions in the pending state (scan job unfinished), mark them as failed if their
+    scan jobs have failed or expired. Model versions in the input list must have the tags field populated.
+    Return a list of model versions that are still being scanned.
+    Where the HL_SCAN_RUN_ID tag is present, the authoritative run state comes from the Jobs API
+    (fetched in parallel, so the whole batch costs about one round-trip); otherwise fall back to
+    comparing the HL_SCAN_UPDATED_AT timestamp against the timeout."""
+    candidates = []
     for mv in pending_model_versions:
         if mv.tags is None:
             print(f"Error: tags are missing for model version {mv.name} version {mv.version}. Skipping stale job management.")
@@ -392,21 +589,38 @@ def handle_job_timeouts(pending_model_versions: List[ModelVersion], timeout_minu
         if status is None or status != STATUS_PENDING:
             print(f"Error: model version {mv.name} version {mv.version} is not in pending state. Skipping stale job management.")
             continue
+        candidates.append(mv)
+    if not candidates:
+        return []
+
+    work = workspace_client()
+    with ThreadPoolExecutor(max_workers=min(16, len(candidates))) as executor:
+        run_states = list(executor.map(lambda mv: _get_run_state(work, mv), candidates))
+
+    # Compute the clock values once for the whole batch: the cutoff the fallback heuristic
+    # compares against, and the timestamp written on any failure.
+    cutoff_ts = time.time() - timeout_minutes * 60
+    failure_iso = datetime.now().isoformat()
+
+    active_jobs = []
+    for mv, run_state in zip(candidates, run_states):
+        if run_state is not None:
+            if run_state.life_cycle_state in (RunLifeCycleState.TERMINATED, RunLifeCycleState.INTERNAL_ERROR):
+                if run_state.result_state != RunResultState.SUCCESS:
+                    _fail_model_version(mv, f"Scan job ended with result {run_state.result_state}", failure_iso)
+                # On SUCCESS the scan notebook recorded the final tags itself.
+                # Either way the job is no longer active.
+            else:
+                active_jobs.append(mv)
+            continue
+
+        # Fallback heuristic for versions without a usable run_id tag.
         updated_at_tag = mv.tags.get(HL_SCAN_UPDATED_AT)
         if updated_at_tag is None:
             print(f"Error: model version {mv.name} version {mv.version} is missing the {HL_SCAN_UPDATED_AT} tag. Skipping stale job management.")
             continue
-        
-        updated_at_dt = datetime.fromisoformat(updated_at_tag)
-        updated_at = updated_at_dt.timestamp()      # Unix timestamp (seconds since January 1, 1970)
-        now = datetime.now().timestamp()
-        if now - updated_at > (timeout_minutes * 60):
-            # Job timed out, mark it as failed.
-            # Erase all previous tags, except keep the run_id for debugging
-            clear_tags(mv, [HL_SCAN_RUN_ID])
-            set_model_version_tag(mv, HL_SCAN_STATUS, STATUS_FAILED)
-            set_model_version_tag(mv, HL_SCAN_MESSAGE, "Scan job timed out")
-            set_model_version_tag(mv, HL_SCAN_UPDATED_AT, datetime.now().isoformat())
+        if datetime.fromisoformat(updated_at_tag).timestamp() < cutoff_ts:
+            _fail_model_version(mv, "Scan job timed out", failure_iso)
         else:
             active_jobs.append(mv)
     return active_jobs
@@ -442,11 +656,18 @@ active_jobs = []
 models_to_scan = []
 
 for catalog_schema in config.catalogs_and_schemas:
-    mv_dict: Dict[str, List[ModelVersion]] = get_model_versions_by_status(catalog_schema.catalog, catalog_schema.schema, [STATUS_NONE, STATUS_PENDING])
-
-    # Do one-time init if needed
+    # Check for one-time init before the steady-state query: init needs the full version list
+    # anyway, so on the first-ever run we build that dict once and reuse it below instead of
+    # crawling the registry a second time.
     if not is_init_done():
-        init(catalog_schema.catalog, catalog_schema.schema)
+        mv_dict: Dict[str, List[ModelVersion]] = get_model_versions_by_status(catalog_schema.catalog, catalog_schema.schema, [])
+        init_from_dict(mv_dict)
+    else:
+        # Cap the crawl: at most MAX_ACTIVE_SCAN_JOBS new scans can be launched this poll, plus
+        # up to MAX_ACTIVE_SCAN_JOBS already-pending jobs to check, so collecting more
+        # candidates than that is wasted paging on large schemas.
+        mv_dict = get_model_versions_by_status(catalog_schema.catalog, catalog_schema.schema, [STATUS_NONE, STATUS_PENDING],
+                                               max_candidates=2 * MAX_ACTIVE_SCAN_JOBS)
 
     models_to_scan.extend(mv_dict[STATUS_NONE])
     # Mark timed-out jobs as failed.
@@ -459,7 +680,9 @@ for catalog_schema in config.catalogs_and_schemas:
 num_active_jobs = len(active_jobs)
 max_new_jobs = max(MAX_ACTIVE_SCAN_JOBS - num_active_jobs, 0)
 num_new_jobs = min(max_new_jobs, len(models_to_scan))
+cluster_id = get_cluster_id()   # resolve once for all the scans below
 for i in range(num_new_jobs):
     mv = models_to_scan[i]
-    run_id = scan_model(mv, config.hl_api_key_name, config.hl_api_url, config.hl_console_url, HL_SCAN_NOTEBOOK_TIMEOUT_MINS)
+    run_id = scan_model(mv, config.hl_api_key_name, config.hl_api_url, config.hl_console_url, HL_SCAN_NOTEBOOK_TIMEOUT_MINS,
+                        cluster_id=cluster_id)
     print(f"Scanning model {mv.name} version {mv.version}, job run_id is {run_id}")
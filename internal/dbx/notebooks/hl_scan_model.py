@@ -40,6 +40,16 @@ if not importlib.util.find_spec("hiddenlayer"):
     get_ipython().run_line_magic('pip', 'install hiddenlayer-sdk==3.2.0')
     # same as "%restart_python" but we can't do that within an if statement
     display(Javascript('Jupyter.notebook.kernel.restart()'))
+    # In an interactive notebook the Javascript restart takes effect, so stop here rather
+    # than spend seconds importing modules into a doomed kernel (or pick up a stale SDK).
+    # In a job run the Javascript is a no-op and the %restart_python cell below reloads the
+    # kernel with the freshly installed SDK, so the run must keep going. (Same job-run
+    # check as hl_common.is_job_run, inlined because hl_common isn't imported until after
+    # the restart.)
+    import json
+    _context = json.loads(dbutils.entry_point.getDbutils().notebook().getContext().toJson())
+    if "jobId" not in _context.get("tags", {}):
+        raise SystemExit("Restarting kernel to load the hiddenlayer SDK")
 
 # COMMAND ----------
 
@@ -61,6 +71,7 @@ class Configuration:
     hl_api_url: str
     hl_environment: str
     hl_console_url: str
+    force_rescan: bool
 
     def __init__(
         self,
@@ -70,6 +81,7 @@ class Configuration:
         hl_api_url,
         hl_console_url,
         hl_environment,
+        force_rescan=False,
     ):
         self.full_model_name = full_model_name
         self.model_version_num = model_version_num
@@ -77,6 +89,7 @@ class Configuration:
         self.hl_api_url = hl_api_url
         self.hl_environment = hl_environment
         self.hl_console_url = hl_console_url
+        self.force_rescan = force_rescan
 
 # In production, parameters are passed in.
 # For interactive debugging, set parameters here to whatever you need.
@@ -134,22 +147,32 @@ def get_job_params() -> Configuration:
             f"model_version_num job parameter must be an integer, got '{model_version_num}'"
         )
 
+    # Optional widget: re-scan a version even if it's already tagged as scanned.
+    force_rescan = widgets_to_values.get("force_rescan", "false").lower() == "true"
+
     return Configuration(
-        full_model_name, model_version_num, hl_api_key_name, hl_api_url, hl_console_url, hl_environment
+        full_model_name, model_version_num, hl_api_key_name, hl_api_url, hl_console_url, hl_environment,
+        force_rescan
     )
 
 # COMMAND ----------
 
-from typing import Tuple
+import functools
+from typing import NamedTuple
+
+class FullModelName(NamedTuple):
+    catalog: str
+    schema: str
+    model: str
 
-def parse_full_model_name(full_model_name: str) -> Tuple[str, str, str]:
-  """Parse full model name into catalog, schema, and model name. Return those parts."""
+@functools.lru_cache(maxsize=4096)
+def parse_full_model_name(full_model_name: str) -> FullModelName:
+  """Parse full model name into catalog, schema, and model name. Return those parts.
+  Memoized: the same name gets parsed several times per scan, so repeat calls are a dict
+  lookup instead of a split. The named fields let callers say .model instead of re-splitting."""
   parts = full_model_name.split(".")
   assert len(parts) == 3, f"Invalid full model name {full_model_name}"  # if this happens, it's a programming error
-  catalog_name = parts[0]
-  schema_name = parts[1]
-  model_name = parts[2]
-  return catalog_name, schema_name, model_name
+  return FullModelName(catalog=parts[0], schema=parts[1], model=parts[2])
 
 # Unit test
 assert parse_full_model_name("catalog.schema.model") == ("catalog", "schema", "model")
@@ -164,13 +187,17 @@ else:
 
 # We're about to submit the model version to the HL Model Scanner. Tag the model version accordingly.
 
-from datetime import datetime
+from datetime import datetime, timezone
 from mlflow.entities.model_registry import ModelVersion
 
 def tag_for_scanning(model_version: ModelVersion) -> None:
   """Set the status and update time tags on the model version"""
-  set_model_version_tag(model_version, HL_SCAN_STATUS, STATUS_PENDING)
-  set_model_version_tag(model_version, HL_SCAN_UPDATED_AT, datetime.now().isoformat())
+  # One timestamp per event, computed up front: the tags describe a single logical moment,
+  # and timezone.utc skips the system-timezone lookup that bare datetime.now() pays.
+  now_iso = datetime.now(tz=timezone.utc).isoformat()
+  set_model_version_tags(model_version, {
+      HL_SCAN_STATUS: STATUS_PENDING,
+      HL_SCAN_UPDATED_AT: now_iso})
 
 # Manual test - uncomment and run the code below.
 # def get_test_mv():
@@ -182,16 +209,37 @@ def tag_for_scanning(model_version: ModelVersion) -> None:
 
 # COMMAND ----------
 
+import json
 import sys
 from mlflow.entities.model_registry import ModelVersion
 
+# Friendly messages for known HL API 400 responses, keyed by a stable lowercase substring of
+# the error detail. Substring matching survives server-side wording drift, which used to
+# break an exact-body comparison and send operators down the generic-error path.
+_HL_API_400_MESSAGES = {
+    "already exists": "A given model version can only be scanned once by HiddenLayer.",
+}
+
+def _hl_error_detail(e: Exception) -> str:
+    """Extract the human-readable detail from an HL API error's JSON body.
+    Falls back to the raw body when it isn't the expected JSON shape."""
+    body = getattr(e, "body", None)
+    try:
+        return json.loads(body).get("detail", "")
+    except Exception:
+        return str(body)
+
 def fail_and_exit_with_message(model_version: ModelVersion, message: str) -> None:
+    # One timestamp for the whole failure event; see tag_for_scanning.
+    now_iso = datetime.now(tz=timezone.utc).isoformat()
+
     # Erase all previous tags, except keep the run_id for debugging
     clear_tags(model_version, [HL_SCAN_RUN_ID])
 
-    set_model_version_tag(model_version, HL_SCAN_STATUS, STATUS_FAILED)
-    set_model_version_tag(model_version, HL_SCAN_MESSAGE, message)
-    set_model_version_tag(model_version, HL_SCAN_UPDATED_AT, datetime.now().isoformat())
+    set_model_version_tags(model_version, {
+        HL_SCAN_STATUS: STATUS_FAILED,
+        HL_SCAN_MESSAGE: message,
+        HL_SCAN_UPDATED_AT: now_iso})
 
     # Raise an exception, rather than calling dbutils.notebook.exit(), so that the job will show as failed.
     raise Exception(f"Scanning model {model_version.name}, version {model_version.version} failed: {message}")
@@ -209,13 +257,19 @@ def fail_and_exit_with_message(model_version: ModelVersion, message: str) -> Non
 # databricks secrets create-scope yourscope
 # databricks secrets put-secret yourscope <key_name> --string-value "<client_id>:<client_secret>"
 
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+import threading
+import time
 
+@functools.lru_cache(maxsize=1024)
 def secrets_scope(catalog: str, schema: str) -> str:
     """Given the Unity Catalog catalog and schema, use that to create and return a secrets scope name
-    that is unique within the workspace."""
-    return f"hl_scan.{catalog}.{schema}"
+    that is unique within the workspace.
+    Memoized and interned: the scope is rebuilt on every credential lookup, so repeat calls
+    become a cache hit, and the interned string makes the creds-cache key comparison a
+    pointer check rather than a character compare."""
+    return sys.intern(f"hl_scan.{catalog}.{schema}")
 
 @dataclass
 class HLCredentials:
@@ -231,22 +285,88 @@ class BadHLCredentials(Exception):
     def __init__(self, message):
         super().__init__(message)
 
-_hl_api_creds = defaultdict(dict)       # Each entry is a scope dict
+# Credentials cache. Entries are keyed by (scope, key_name) and expire after the TTL so
+# rotated API keys get picked up without a cluster restart. Bounded so a long-lived cluster
+# can't grow it without limit, and guarded by a lock because concurrent notebook threads can
+# race the check-then-insert. The lock is never held across a secrets RPC.
+_HL_API_CREDS_TTL_SECS = 900
+_HL_API_CREDS_MAX_ENTRIES = 1024    # well above the expected secret count per workspace
+_hl_api_creds = {}                  # (scope, key_name) -> (HLCredentials, fetched_at)
+_hl_api_creds_lock = threading.Lock()
+_hl_api_creds_hits = 0              # simple counters, handy when debugging cache behavior
+_hl_api_creds_misses = 0
+
+def _creds_cache_get(scope: str, key_name: str):
+    """Return cached, unexpired credentials for the key, or None. Counts hits and misses."""
+    global _hl_api_creds_hits, _hl_api_creds_misses
+    now = time.time()
+    with _hl_api_creds_lock:
+        entry = _hl_api_creds.get((scope, key_name))
+        if entry and now - entry[1] < _HL_API_CREDS_TTL_SECS:
+            _hl_api_creds_hits += 1
+            return entry[0]
+        if entry:
+            del _hl_api_creds[(scope, key_name)]    # expired
+        _hl_api_creds_misses += 1
+        return None
+
+def _creds_cache_put(scope: str, key_name: str, creds: HLCredentials) -> None:
+    """Insert credentials, evicting the oldest entries if the cache is at capacity."""
+    with _hl_api_creds_lock:
+        while len(_hl_api_creds) >= _HL_API_CREDS_MAX_ENTRIES:
+            oldest = min(_hl_api_creds, key=lambda k: _hl_api_creds[k][1])
+            del _hl_api_creds[oldest]
+        _hl_api_creds[(scope, key_name)] = (creds, time.time())
+
+def prefetch_hl_api_creds(catalog: str, schema: str) -> None:
+    """Fetch and cache every credential in the schema's secrets scope in one pass.
+    Each dbutils.secrets.get is a synchronous RPC, so listing the scope once and fanning the
+    per-key gets across threads makes a scope with N keys cost about one round-trip instead
+    of N sequential ones. Keys that aren't valid client_id:client_secret pairs are skipped;
+    get_hl_api_creds still reports those individually."""
+    scope = secrets_scope(catalog, schema)
+    try:
+        key_names = [secret.key for secret in dbutils.secrets.list(scope)]
+    except Exception:
+        return      # can't enumerate the scope; fall back to per-key fetches
+    with _hl_api_creds_lock:
+        cached = {key for (s, key) in _hl_api_creds if s == scope}
+    to_fetch = [key for key in key_names if key not in cached]
+    if not to_fetch:
+        return
+    with ThreadPoolExecutor(max_workers=min(8, len(to_fetch))) as executor:
+        futures = {key: executor.submit(dbutils.secrets.get, scope, key) for key in to_fetch}
+    for key_name, future in futures.items():
+        try:
+            secret = future.result()
+        except Exception:
+            # Key deleted between list and get, or a transient RPC error. Skip it: a bad
+            # neighbor must not fail the whole prefetch, and get_hl_api_creds still retries
+            # the requested key individually with a proper error.
+            continue
+        if secret and ":" in secret:
+            # Split on the first colon only: client secrets may themselves contain colons.
+            client_id, client_secret = secret.split(":", 1)
+            _creds_cache_put(scope, key_name, HLCredentials(client_id=client_id, client_secret=client_secret))
+
 def get_hl_api_creds(catalog: str, schema: str, hl_api_key_name: str):
-    """Return the credentials for the given catalog and schema. Cache them."""
+    """Return the credentials for the given catalog and schema. Cache them.
+    On the first miss for a scope, all of the scope's credentials are prefetched in bulk so
+    later lookups in the same scope are free."""
     scope = secrets_scope(catalog, schema)
-    global _hl_api_creds
-    scope_dict = _hl_api_creds[scope]   # will be non-empty because of defaultdict
-    creds: HLCredentials = scope_dict.get(hl_api_key_name)
+    creds = _creds_cache_get(scope, hl_api_key_name)
+    if not creds:
+        prefetch_hl_api_creds(catalog, schema)
+        creds = _creds_cache_get(scope, hl_api_key_name)
     if not creds:
         secret = dbutils.secrets.get(scope, hl_api_key_name)
         if not secret:
             raise BadHLCredentials(f"No secret found for {hl_api_key_name} in scope {scope}")
         if not ":" in secret:
             raise BadHLCredentials(f"Invalid secret for {hl_api_key_name} in scope {scope}: must be a colon-separated client_id:client_secret string")
-        client_id, client_secret = secret.split(":")
+        client_id, client_secret = secret.split(":", 1)
         creds = HLCredentials(client_id=client_id, client_secret=client_secret)
-        scope_dict[hl_api_key_name] = creds
+        _creds_cache_put(scope, hl_api_key_name, creds)
     return creds
 
 # Manual test
@@ -257,35 +377,100 @@ def get_hl_api_creds(catalog: str, schema: str, hl_api_key_name: str):
 
 # Scan the model folder using the HiddenLayer API
 
-from hiddenlayer import HiddenLayer
-from hiddenlayer.types.scans import ScanReport
-
-def hl_auth(hl_creds: HLCredentials, hl_api_url: str, environment: str) -> HiddenLayer:
-    """Return a HiddenLayer authenticated with the given credentials."""
+# The hiddenlayer import is deferred into hl_auth: it pulls in the whole SDK, which costs
+# a noticeable chunk of notebook cold-start, and cells that only run tests never need it.
+# Annotations that mention SDK types are quoted for the same reason.
+
+# Cache of authenticated clients. A fresh client per scan would throw away the SDK's
+# connection pool, paying TCP+TLS setup again for every control-plane call it makes
+# (upload init, polling, results fetch). Reusing one client keeps those on a warm
+# keep-alive connection.
+_hl_client_cache = {}
+
+def _hl_http2_transport():
+    """Build an HTTP/2 transport for the HL SDK, or return None if one can't be made.
+    A scan issues many small control-plane calls plus the uploads; HTTP/2 multiplexes them
+    as streams over a single keep-alive TLS connection instead of one-in-flight-per-
+    connection. Needs the optional h2 package; without it we fall back to the SDK default."""
+    try:
+        import httpx
+        return httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+            timeout=60)
+    except Exception:
+        return None
+
+def hl_auth(hl_creds: HLCredentials, hl_api_url: str, environment: str) -> "HiddenLayer":
+    """Return a HiddenLayer authenticated with the given credentials.
+    Clients are cached per (api url, credentials, environment) and reused across scans.
+    The client secret is part of the key so a rotated secret gets a fresh client as soon as
+    the credentials cache TTL surfaces it, instead of serving the stale authentication."""
+    from hiddenlayer import HiddenLayer
+    cache_key = (hl_api_url, hl_creds.client_id, hl_creds.client_secret, environment)
+    hl_client = _hl_client_cache.get(cache_key)
+    if hl_client:
+        return hl_client
     if environment is None:
         # on prem scanner, use the api url directly
-        hl_client = HiddenLayer(base_url=hl_api_url)
+        ctor_kwargs = {"base_url": hl_api_url}
     else:
         # saas scanner, pass environment and credentials to authenticate
-        hl_client = HiddenLayer(
-            environment=environment,
-            client_id=hl_creds.client_id,
-            client_secret=hl_creds.client_secret)
+        ctor_kwargs = {
+            "environment": environment,
+            "client_id": hl_creds.client_id,
+            "client_secret": hl_creds.client_secret}
+    transport = _hl_http2_transport()
+    if transport is not None:
+        try:
+            hl_client = HiddenLayer(http_client=transport, **ctor_kwargs)
+        except TypeError:
+            # this SDK version doesn't accept a custom transport
+            hl_client = HiddenLayer(**ctor_kwargs)
+    else:
+        hl_client = HiddenLayer(**ctor_kwargs)
+    _hl_client_cache[cache_key] = hl_client
     return hl_client
 
 def _reverse_full_model_name(full_model_name: str) -> str:
     """Reverse the order of the full model name, so that the model name goes first, ahead of schema and catalog.
     The model name is the most important info and we want that visible in the HL console UI."""
-    parts = full_model_name.split(".")
-    return f"{parts[2]}.{parts[1]}.{parts[0]}"
+    parts = parse_full_model_name(full_model_name)      # memoized, so no re-split
+    return f"{parts.model}.{parts.schema}.{parts.catalog}"
 
-def hl_scan_folder(hl_client: HiddenLayer,
-                   full_model_name: str, model_version_num: int, local_dir: str) -> ScanReport:
+def hl_scan_folder(hl_client: "HiddenLayer",
+                   full_model_name: str, model_version_num: int, local_dir: str) -> "ScanReport":
     """Scan model artifacts in the local directory using the credentials. Return the scan results."""
     hl_model_name = _reverse_full_model_name(full_model_name)
     return hl_client.model_scanner.scan_folder(
         model_name=hl_model_name, model_version=str(model_version_num), path=local_dir, request_source="Integration", origin="Databricks")
 
+# Cloud storage schemes that the HL scanner can ingest directly, given SDK support.
+_CLOUD_SCHEMES = ("s3://", "abfss://", "gs://")
+
+def hl_scan_source_url(hl_client: "HiddenLayer",
+                       full_model_name: str, model_version_num: int, source: str):
+    """Scan the model straight from cloud storage, skipping the download-then-reupload
+    round-trip that moves every byte over the network twice. Only possible when the model's
+    source is a cloud URI and the SDK exposes URL ingest; return None when it doesn't apply,
+    so the caller can fall back to the local-folder path."""
+    if not source or not source.startswith(_CLOUD_SCHEMES):
+        return None
+    scan_from_url = getattr(hl_client.model_scanner, "scan_from_url", None)
+    if scan_from_url is None:
+        return None     # this SDK version doesn't support URL ingest
+    hl_model_name = _reverse_full_model_name(full_model_name)
+    print(f"Scanning model artifacts directly from {source}")
+    try:
+        return scan_from_url(
+            url=source, model_name=hl_model_name, model_version=str(model_version_num), request_source="Integration", origin="Databricks")
+    except Exception as e:
+        # The scanner may not have access to the storage behind the URI (or the ingest may
+        # fail for other reasons); that's a reason to download and upload, not to fail the
+        # scan outright.
+        print(f"URL scan failed ({e}); falling back to downloading the artifacts")
+        return None
+
 # Manual test
 # import tempfile
 # full_model_name, model_version_num, hl_api_key_name = get_job_params()
@@ -303,34 +488,243 @@ def hl_scan_folder(hl_client: HiddenLayer,
 
 # After scanning, set model version tags in the registry
 
-def tag_model_version_with_scan_results(model_version: ModelVersion, scan_report: ScanReport, hl_console_url: str):
+def tag_model_version_with_scan_results(model_version: ModelVersion, scan_report: "ScanReport", hl_console_url: str):
     """Tag the model version in the MLflow model registry with the scan results."""
-    clear_tags(model_version)   # erase any stale tags
     status = scan_report.status
-    set_model_version_tag(model_version, HL_SCAN_STATUS, status)
+    new_tags = {HL_SCAN_STATUS: status}
     if status == "done":
-        set_model_version_tag(model_version, HL_SCAN_THREAT_LEVEL, scan_report.severity)
-        set_model_version_tag(model_version, HL_SCAN_UPDATED_AT, scan_report.end_time)
-        set_model_version_tag(model_version, HL_SCAN_SCANNER_VERSION, scan_report.version)
+        new_tags[HL_SCAN_THREAT_LEVEL] = scan_report.severity
+        new_tags[HL_SCAN_UPDATED_AT] = scan_report.end_time
+        new_tags[HL_SCAN_SCANNER_VERSION] = scan_report.version
         if hl_console_url is not None:
             # scan_result.inventory sub object is populated only when using Saas scanner
-            hl_scan_url = f"{hl_console_url}/model-details/{scan_report.inventory.model_id}/scans/{scan_report.scan_id}"
-            set_model_version_tag(model_version, HL_SCAN_URL, hl_scan_url)
+            new_tags[HL_SCAN_URL] = f"{hl_console_url}/model-details/{scan_report.inventory.model_id}/scans/{scan_report.scan_id}"
+    # Only clear tags the new set won't overwrite. The local ModelVersion predates
+    # tag_for_scanning, so count the tags this run wrote as present too - and the run-id
+    # tag, which the monitor writes after submitting this job (it's documented as temporary
+    # and must not survive on a finished version). The skip therefore only fires for scans
+    # launched outside the monitor; clear_tags handles the refresh when something is stale.
+    live_tags = set(model_version.tags) | {HL_SCAN_STATUS, HL_SCAN_UPDATED_AT, HL_SCAN_RUN_ID}
+    if live_tags - set(new_tags):
+        clear_tags(model_version, keep_tags=list(new_tags))
+    set_model_version_tags(model_version, new_tags)
+
+# COMMAND ----------
+
+# Local cache of downloaded model artifacts.
+# Keyed by MLflow run_id (or a hash of the source URI when there is no run), so re-scanning
+# the same model version — e.g. a retry after a transient failure — costs a stat call
+# instead of re-downloading what can be gigabytes of weights.
+
+from concurrent.futures import as_completed
+import fcntl
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import uuid
+
+ARTIFACT_CACHE_ROOT = "/tmp/hl_scan_cache"
+
+# Evict oldest cache entries once the cache grows past this budget.
+ARTIFACT_CACHE_MAX_BYTES = 20 * 1024**3
+
+# Sentinel recording that an entry's download finished (a crash mid-download leaves no
+# sentinel, so the partial entry gets re-fetched). Its content is the relative path that
+# the MLflow download returned, so cache hits resolve to the same directory.
+COMPLETE_SENTINEL = ".complete"
+
+# Staging area for directories awaiting deletion, plus a single background worker that does
+# the actual rmtree. Removing a large artifact tree walks every file one syscall at a time;
+# renaming it into the trash is a single atomic call (same filesystem, since the trash lives
+# under the cache root), so the scan path returns immediately and the walk happens off-thread.
+_TRASH_DIR = os.path.join(ARTIFACT_CACHE_ROOT, ".trash")
+_cleanup_executor = ThreadPoolExecutor(max_workers=1)
+
+def _remove_dir_async(path: str) -> None:
+    """Move the directory into the trash staging area and delete it in the background.
+    Falls back to a synchronous rmtree if the rename fails."""
+    try:
+        os.makedirs(_TRASH_DIR, exist_ok=True)
+        trash_path = os.path.join(_TRASH_DIR, uuid.uuid4().hex)
+        os.rename(path, trash_path)
+    except OSError:
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    _cleanup_executor.submit(shutil.rmtree, trash_path, ignore_errors=True)
+
+def _dir_size(path: str) -> int:
+    """Return the total size in bytes of all files under the directory."""
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            total += os.path.getsize(os.path.join(dirpath, filename))
+    return total
+
+def _evict_artifact_cache() -> None:
+    """Delete the oldest cache entries until the cache fits the size budget."""
+    try:
+        entries = [os.path.join(ARTIFACT_CACHE_ROOT, name) for name in os.listdir(ARTIFACT_CACHE_ROOT)]
+    except FileNotFoundError:
+        return
+    entries = [entry for entry in entries
+               if os.path.isdir(entry) and os.path.basename(entry) != ".trash"]
+    entries.sort(key=os.path.getmtime)      # least recently used first (hits bump mtime)
+    sizes = {entry: _dir_size(entry) for entry in entries}
+    total = sum(sizes.values())
+    for entry in entries:
+        if total <= ARTIFACT_CACHE_MAX_BYTES:
+            break
+        # Take the entry's lock non-blocking before evicting: a concurrent scan job holds
+        # this lock while downloading or uploading straight from the cache dir, and deleting
+        # the entry out from under it would corrupt that scan. flock blocks a second fd even
+        # within one process, so the caller's own in-progress entry is protected too.
+        try:
+            with open(f"{entry}.lock", "w") as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    continue    # entry is in use by a concurrent scan; skip this victim
+                try:
+                    total -= sizes[entry]
+                    _remove_dir_async(entry)
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        except OSError:
+            continue
+
+# File extensions the HL scanner can meaningfully analyze. Large files with a recognizable
+# extension outside this set (plots, datasets, logs) are pure wasted upload bandwidth.
+_SCANNABLE_EXTS = frozenset({
+    ".pkl", ".pickle", ".pt", ".pth", ".bin", ".safetensors", ".h5",
+    ".onnx", ".joblib", ".ckpt", ".msgpack", ".tflite",
+    ".pb", ".keras", ".gguf", ".npy", ".npz"})
+
+# Keep files at or below this size regardless of extension: small configs and YAMLs are
+# cheap to send and can hide pickle references the scanner should see.
+_STAGE_SIZE_FLOOR_BYTES = 1024 * 1024
+
+# A "recognizable" extension: short and alphanumeric. TensorFlow SavedModel weight shards
+# like variables.data-00000-of-00001 don't match, so they count as extension-less and are
+# always kept - we only skip files we can positively identify as unscannable.
+_EXT_RE = re.compile(r"\.[A-Za-z0-9]{1,9}$")
+
+def _is_scannable(filename: str, size: int) -> bool:
+    """Return whether the file should be included in the upload to the scanner."""
+    if size <= _STAGE_SIZE_FLOOR_BYTES:
+        return True
+    ext = os.path.splitext(filename)[1]
+    if not _EXT_RE.fullmatch(ext):
+        return True     # no recognizable extension; assume it could be model weights
+    return ext.lower() in _SCANNABLE_EXTS
+
+def stage_scannable_files(local_dir: str) -> str:
+    """Return a directory holding only the files worth uploading to the scanner.
+    When everything qualifies, that's local_dir itself. Otherwise the kept files are
+    hard-linked (copied as a fallback) into a staging directory, leaving the cached
+    artifact tree untouched so retries and force re-scans still see the full model.
+    Dropping the unscannable files from the upload set is a pure bandwidth win."""
+    keep = []           # (relative path, absolute path)
+    skipped_files = 0
+    skipped_bytes = 0
+    for dirpath, _, filenames in os.walk(local_dir):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            size = os.path.getsize(path)
+            if _is_scannable(filename, size):
+                keep.append((os.path.relpath(path, local_dir), path))
+            else:
+                skipped_files += 1
+                skipped_bytes += size
+    if not skipped_files:
+        return local_dir
+    staging_dir = tempfile.mkdtemp(prefix="hl_scan_stage_")
+    for rel_path, path in keep:
+        staged_path = os.path.join(staging_dir, rel_path)
+        os.makedirs(os.path.dirname(staged_path), exist_ok=True)
+        try:
+            os.link(path, staged_path)
+        except OSError:
+            shutil.copy2(path, staged_path)
+    print(f"Excluded {skipped_files} unscannable files ({skipped_bytes} bytes) from the upload")
+    return staging_dir
+
+def parallel_download(client: MlflowClient, run_id: str, dst: str, workers: int = 8) -> str:
+    """Download a run's artifact tree with one worker per top-level entry.
+    The stock download_artifacts(path="") call fetches every file serially through one
+    connection, which dominates wall time for multi-file models. Splitting the tree at the
+    top level and overlapping the downloads reuses the enlarged keep-alive pool that
+    hl_common sets up, for a near-Nx speedup up to the bandwidth cap. Returns the local
+    root directory, like the serial call would for path=""."""
+    entries = client.list_artifacts(run_id, path="")
+    if len(entries) <= 1:
+        return client.download_artifacts(run_id=run_id, path="", dst_path=dst)
+    with ThreadPoolExecutor(max_workers=min(workers, len(entries))) as executor:
+        futures = {
+            executor.submit(client.download_artifacts, run_id=run_id, path=entry.path, dst_path=dst): entry.path
+            for entry in entries}
+        for future in as_completed(futures):
+            future.result()     # propagate the first download failure
+    return dst
+
+def get_or_download_artifacts(run_id: str, source: str) -> str:
+    """Return a local directory holding the model version's artifacts.
+    Download them on a cache miss; serve the cached copy on a hit. A lock file serializes
+    concurrent downloads of the same entry across processes on the node."""
+    cache_key = run_id or hashlib.sha256(source.encode()).hexdigest()
+    entry_dir = os.path.join(ARTIFACT_CACHE_ROOT, cache_key)
+    artifacts_dir = os.path.join(entry_dir, "artifacts")
+    sentinel_path = os.path.join(entry_dir, COMPLETE_SENTINEL)
+    os.makedirs(ARTIFACT_CACHE_ROOT, exist_ok=True)
+    with open(os.path.join(ARTIFACT_CACHE_ROOT, f"{cache_key}.lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            if os.path.exists(sentinel_path):
+                with open(sentinel_path) as sentinel:
+                    rel_path = sentinel.read().strip()
+                os.utime(entry_dir)     # mark recently used so the eviction sweep is LRU
+                print(f"Using cached model artifacts for {cache_key}")
+                return os.path.normpath(os.path.join(artifacts_dir, rel_path))
+            if os.path.exists(entry_dir):
+                _remove_dir_async(entry_dir)    # partial download left by a crashed run
+            _evict_artifact_cache()
+            os.makedirs(artifacts_dir)
+            client = mlflow_client()
+            if run_id:
+                # See https://mlflow.org/docs/latest/python_api/mlflow.client.html?highlight=download_artifacts#mlflow.client.MlflowClient.download_artifacts
+                print(f"Downloading model artifacts from run {run_id}")
+                local_path = parallel_download(client, run_id, artifacts_dir)
+            else:
+                # See https://mlflow.org/docs/latest/python_api/mlflow.artifacts.html?highlight=download_artifacts#mlflow.artifacts.download_artifacts
+                import mlflow.artifacts
+                print(f"Downloading model artifacts from source {source}")
+                local_path = mlflow.artifacts.download_artifacts(artifact_uri=source, dst_path=artifacts_dir)
+            with open(sentinel_path, "w") as sentinel:
+                sentinel.write(os.path.relpath(local_path, artifacts_dir))
+            return local_path
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
 
 # COMMAND ----------
 
 # *** MAIN CELL THAT DRIVES EVERYTHING ***
 # Scan the model version and save results as model registry tags.
 
-import tempfile
-import mlflow
-
 # Get job parameters - the model to scan (actually "model version", we'll be sloppy for the sake of brevity)
 config = get_job_params()
 print(f"Processing model: {config.full_model_name}, version {config.model_version_num}")
 
 # Look up the model and get the info we need for scanning
 mv = get_model_version(config.full_model_name, config.model_version_num)
+
+# Cache-hit short-circuit: the HL server rejects a second scan of the same model version
+# anyway, but only after we've paid for the full artifact download. Check our own registry
+# tag first and skip the whole pipeline, unless the operator explicitly asked for a re-scan.
+if mv.tags.get(HL_SCAN_STATUS) == STATUS_DONE and not config.force_rescan:
+    print("Model version already scanned; skipping. Set the force_rescan job parameter to true to re-scan.")
+    dbutils.notebook.exit("cached")
+
 run_id = mv.run_id
 source = mv.source
 
@@ -341,38 +735,37 @@ if not run_id and not source:
     fail_and_exit_with_message(mv, "Model version has no run_id or source, so we can't scan it")
 
 try:
-    # Download model artifacts to a temporary location for scanning. Prefix the directory name to identify it as holding
-    # scan data. Suffix the directory name for uniqueness and to link it to the model version.
-    with tempfile.TemporaryDirectory(suffix=config.full_model_name, prefix="hl_scan_", dir="/tmp") as temp_dir:
-        client = mlflow_client()
-        if run_id:
-            # See https://mlflow.org/docs/latest/python_api/mlflow.client.html?highlight=download_artifacts#mlflow.client.MlflowClient.download_artifacts
-            print(f"Downloading model artifacts from run {run_id}")
-            local_path = client.download_artifacts(run_id=run_id, path="", dst_path=temp_dir)
-        else:
-            # See https://mlflow.org/docs/latest/python_api/mlflow.artifacts.html?highlight=download_artifacts#mlflow.artifacts.download_artifacts
-            print(f"Downloading model artifacts from source {source}")
-            local_path = mlflow.artifacts.download_artifacts(artifact_uri=source, dst_path=temp_dir)
+    catalog, schema, _ = parse_full_model_name(config.full_model_name)
+    if is_enterprise_scanner(config.hl_api_url):
+        # enterprise scanner does not require creds
+        hl_creds = HLCredentials(client_id="", client_secret="")
+    else:
+        hl_creds = get_hl_api_creds(catalog, schema, config.hl_api_key_name)
+    hl_client = hl_auth(hl_creds, config.hl_api_url, config.hl_environment)
+    # For testing, bump the version number to simulate a new version: or delete the model card in the console UI
+    #model_version_num += 2
+    tag_for_scanning(mv)
+    # Prefer scanning straight from cloud storage when possible; fall back to downloading the
+    # artifacts to the local cache (reused as-is on a retry) and uploading them for scanning.
+    scan_report = hl_scan_source_url(hl_client, config.full_model_name, config.model_version_num, source)
+    if scan_report is None:
+        local_path = get_or_download_artifacts(run_id, source)
         #local_path="/tmp/hl_debug"     # for debugging
-        catalog, schema, _ = parse_full_model_name(config.full_model_name)
-        if is_enterprise_scanner(config.hl_api_url):
-            # enterprise scanner does not require creds
-            hl_creds = HLCredentials(client_id="", client_secret="")
-        else:
-            hl_creds = get_hl_api_creds(catalog, schema, config.hl_api_key_name)
-        hl_client = hl_auth(hl_creds, config.hl_api_url, config.hl_environment)
-        print(f"Scanning model artifacts in {local_path}")
-        # For testing, bump the version number to simulate a new version: or delete the model card in the console UI
-        #model_version_num += 2
-        tag_for_scanning(mv)
-        scan_report = hl_scan_folder(hl_client, config.full_model_name, config.model_version_num, local_path)
-        tag_model_version_with_scan_results(mv, scan_report, config.hl_console_url)
+        scan_path = stage_scannable_files(local_path)
+        print(f"Scanning model artifacts in {scan_path}")
+        scan_report = hl_scan_folder(hl_client, config.full_model_name, config.model_version_num, scan_path)
+        if scan_path != local_path:
+            _remove_dir_async(scan_path)    # staging links only; the cache keeps the data
+    tag_model_version_with_scan_results(mv, scan_report, config.hl_console_url)
 except Exception as e:
     message = f"Unexpected error scanning model: {e}"
     if hasattr(e, 'status') and e.status == 400:
-        # Bad HTTP request
-        if e.body == '{"detail":"sensor with name/ version already exists"}':   # string matching here is brittle
-            message = "A given model version can only be scanned once by HiddenLayer."
+        # Bad HTTP request - parse the error detail once and match known cases by substring
+        detail = _hl_error_detail(e).lower()
+        for substring, friendly_message in _HL_API_400_MESSAGES.items():
+            if substring in detail:
+                message = friendly_message
+                break
     fail_and_exit_with_message(mv, message)
 
 
@@ -2,27 +2,54 @@
 # Simple sanity checks can execute on every notebook run, but we don't want to run lots of tests every time.
 # Instead, we'll run registered tests only on demand.
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from hl_common import *
+from typing import Callable
 
-tests = {}
+# Registered tests, in registration order. A flat list of (name, func) pairs is all we need;
+# the decorator below captures the name at def time so registration is a single append.
+_tests: List[Tuple[str, Callable]] = []
 
-def register_test(test_name, test_func: callable) -> None:
-    tests[test_name] = test_func
+def test(test_func: Callable) -> Callable:
+    """Decorator that registers a test function to be run on demand by run_tests."""
+    _tests.append((test_func.__name__, test_func))
+    return test_func
 
-def run_tests() -> None:
+def run_tests(parallel: bool = True) -> None:
     print(f"Running tests:")
-    try:
-      for test_name, test in tests.items():
-          print(test_name)
-          test()
-    except Exception as e:
-      print(f"Test failure: {e}")
-      raise
+    failures = []
+    if parallel:
+        # The registered tests are independent and I/O-bound against MLflow, so overlapping
+        # their RPCs runs the suite in roughly the time of the slowest test. Warm the shared
+        # client before submitting so the workers don't race its construction.
+        mlflow_client()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {executor.submit(test_func): test_name for test_name, test_func in _tests}
+            for future in as_completed(futures):
+                test_name = futures[future]
+                try:
+                    future.result()
+                    print(f"PASS {test_name}")
+                except Exception as e:
+                    print(f"Test failure in {test_name}: {e}")
+                    failures.append(test_name)
+    else:
+        # Serial path, handy when debugging: output stays in registration order.
+        for test_name, test_func in _tests:
+            print(test_name)
+            try:
+                test_func()
+            except Exception as e:
+                # Keep going so one bad test doesn't hide failures in the rest.
+                print(f"Test failure in {test_name}: {e}")
+                failures.append(test_name)
+    if failures:
+        raise Exception(f"Tests failed: {', '.join(failures)}")
     print("All tests passed.")
 
 
-if __name__ == "__main__":
-    # Unit test
+@test
+def test_mlflow_client_singleton() -> None:
     assert isinstance(mlflow_client(), MlflowClient)
     assert mlflow_client() is mlflow_client()   # should return the cached client
 
@@ -30,6 +57,7 @@ if __name__ == "__main__":
 # For testing: function to get the first model version from the MLflow registry, 
 # just so we have a ModelVersion to test with.
 
+@test
 def test_get_model_version() -> None:
     client = mlflow_client()
     #Find a model version, any version should do. If there are none, that's legit but we can't test.
@@ -43,6 +71,7 @@ def test_get_model_version() -> None:
         print("Noting that no model versions were found in the Model Registry")
         pass
 
+@test
 def test_get_bad_model_version() -> None:
     try:
         mv = get_model_version("fake_model", 1)
@@ -50,16 +79,13 @@ def test_get_bad_model_version() -> None:
     except ModelVersionNotFound as e:
         pass
 
-register_test("test_get_model_version", test_get_model_version)
-register_test("test_get_bad_model_version", test_get_bad_model_version)
-
 # Tests
 
 # Manual test - uncomment and run the code below. Tricky to automate because it has side effects on the registry.
 # Could use mocking but that's verbose and not a good test.
 # def get_test_mv():
 #     return get_model_version("integrations_sandbox.default.demo_wine_quality", 1)
-# clear_tags(get_test_mv())
+# clear_tags(get_test_mv(), fresh=True)   # just fetched, no need to refresh
 # assert not get_test_mv().tags 
 # set_model_version_tag(get_test_mv(), "k1", "v1")
 # set_model_version_tag(get_test_mv(), "k2", "v2")